@@ -1,7 +1,130 @@
 import numpy as np
 from matplotlib import pyplot as plt
-from scipy.integrate import simps
 import os
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+@dataclass
+class Spectrum:
+    """
+    Dados de um espectro, com a energia e o fluxo em arrays 1-D contíguos.
+
+    Attributes:
+        energy (numpy.ndarray): Energia (ou largura de banda) de cada ponto.
+        flux (numpy.ndarray): Fluxo de cada ponto.
+    """
+    energy: np.ndarray
+    flux: np.ndarray
+
+if njit is not None:
+    # kf já inclui a divisão pela corrente, restando no máximo uma divisão por ponto
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _bw_to_energy_kernel(energy, flux, ke, kf):
+        for i in prange(energy.size):
+            flux[i] = flux[i] * kf / energy[i]
+            energy[i] *= ke
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _normalize_kernel(energy, flux, ke, kf):
+        for i in prange(energy.size):
+            flux[i] *= kf
+            energy[i] *= ke
+
+    # Converte o espectro (in-place) e já escreve os valores nas unidades do plot, em uma única passada
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _to_plot_space_kernel(energy, flux, ke, kf, bandwidth, inv_ke_plot, kf_plot, out_e, out_f):
+        for i in prange(energy.size):
+            f = flux[i] * kf
+            if bandwidth:
+                f /= energy[i]
+            e = energy[i] * ke
+            flux[i] = f
+            energy[i] = e
+            out_e[i] = e * inv_ke_plot
+            out_f[i] = f * kf_plot
+
+    # Regra de Simpson composta para pontos não igualmente espaçados, equivalente ao scipy.integrate.simpson.
+    # Como no scipy, razões com denominador nulo (energias repetidas) valem 0 em vez de dividir por zero
+    @njit(fastmath=True, cache=True)
+    def _simpson_kernel(y, x):
+        n = y.size
+        if n < 2:
+            return 0.0
+        if n == 2:
+            return 0.5 * (x[1] - x[0]) * (y[0] + y[1])
+        s = 0.0
+        for i in range(1, n - 1, 2):
+            h0 = x[i] - x[i-1]
+            h1 = x[i+1] - x[i]
+            hs = h0 + h1
+            hp = h0 * h1
+            h0_h1 = h0 / h1 if h1 != 0 else 0.0
+            h1_h0 = 1 / h0_h1 if h0_h1 != 0 else 0.0
+            hs_hp = hs / hp if hp != 0 else 0.0
+            s += hs / 6 * (y[i-1] * (2 - h1_h0) + y[i] * hs * hs_hp + y[i+1] * (2 - h0_h1))
+        # Com número par de pontos sobra o último intervalo, corrigido como no scipy
+        if n % 2 == 0:
+            h0 = x[n-2] - x[n-3]
+            h1 = x[n-1] - x[n-2]
+            den = 6 * (h0 + h1)
+            alpha = (2*h1*h1 + 3*h0*h1) / den if den != 0 else 0.0
+            den = 6 * h0
+            beta = (h1*h1 + 3*h0*h1) / den if den != 0 else 0.0
+            den = 6 * h0 * (h0 + h1)
+            eta = h1**3 / den if den != 0 else 0.0
+            s += alpha * y[n-1] + beta * y[n-2] - eta * y[n-3]
+        return s
+
+def _envelope(x, y, n_cols=2000):
+    """
+    Reduz a curva aos pontos de mínimo e de máximo de y em cada uma de n_cols colunas de x,
+    mais o primeiro e o último ponto, mantendo o envelope que aparece no plot com no máximo
+    2*n_cols + 2 pontos, todos pertencentes aos dados.
+    """
+    if np.any(np.diff(x) < 0):
+        order = np.argsort(x, kind='stable')
+        x, y = x[order], y[order]
+    edges = np.linspace(x[0], x[-1], n_cols + 1)
+    # Colunas vazias geram índices repetidos, que o reduceat não aceita
+    starts = np.unique(np.searchsorted(x, edges[:-1]))
+    counts = np.diff(np.append(starts, x.size))
+    y_min = np.minimum.reduceat(y, starts)
+    y_max = np.maximum.reduceat(y, starts)
+    # Primeira amostra de cada coluna igual ao mínimo/máximo, em tempo linear; colunas com NaN
+    # não têm amostra igual ao extremo e ficam com a primeira amostra da coluna
+    idx = np.arange(x.size)
+    i_min = np.minimum.reduceat(np.where(y == np.repeat(y_min, counts), idx, x.size), starts)
+    i_max = np.minimum.reduceat(np.where(y == np.repeat(y_max, counts), idx, x.size), starts)
+    i_min = np.where(i_min == x.size, starts, i_min)
+    i_max = np.where(i_max == x.size, starts, i_max)
+    keep = np.unique(np.concatenate(([0], i_min, i_max, [x.size - 1])))
+    return x[keep], y[keep]
+
+def _sci_width(values, decimal_places):
+    """
+    Largura máxima dos valores em notação científica. Só os extremos de |valor| podem ter
+    expoente de três dígitos, então basta formatá-los em vez de formatar todos os valores.
+    """
+    # Sinal, dígito, ponto, casas decimais e 'E+NN'
+    width = decimal_places + 7
+    finite = np.abs(values[np.isfinite(values) & (values != 0)])
+    if finite.size:
+        sign = -1 if np.any(values < 0) else 1
+        for v in (finite.max(), finite.min()):
+            width = max(width, len(f'{sign * v:.{decimal_places}E}'))
+    return width
 
 class Espectros:
     energy_unit = { 'eV': 1e0,
@@ -10,54 +133,157 @@ class Espectros:
                    'GeV': 1e9}
     flux_unit = {'ph/s/eV':      1,
                  'ph/s/0.1%': 1000}
+    cache_ext = '.npz'
+    comment_char = '#'
+    # Unidades padrão dos plots, usadas por plot_spectrum_data e plot_folder_spectrum
+    plot_energy_u = 'keV'
+    plot_flux_u = 'ph/s/eV'
+    plot_current = 350
     
-    def __init__(self):
-        pass
+    def __init__(self, cache=False):
+        """
+        Args:
+            cache (bool, optional): Salva os espectros lidos em arquivos .npz ao lado dos originais,
+                                    evitando reler o texto nas próximas execuções. O padrão é False.
+        """
+        self.cache = cache
 
-    def get_spectrum_data(self, filename):
+    def get_spectrum_data(self, filename, flux_column=1):
         """
         Carrega dados de espectro de um arquivo, se for um arquivo de espectro válido.
 
         Args:
             filename (str): Caminho para o arquivo de espectro.
+            flux_column (int, optional): Índice da coluna de fluxo no arquivo. A energia é sempre a primeira coluna. O padrão é 1.
 
         Returns:
-            numpy.ndarray: Dados do espectro como um array numpy, 
-                            onde a primeira coluna é a energia e a segunda é o fluxo.
-                            Retorna None se o arquivo não for um espectro válido.
+            Spectrum: Dados do espectro, com os arrays de energia e fluxo.
+                      Retorna None se o arquivo não for um espectro válido.
+        """
+        data = None
+        key = None
+        if self.cache:
+            cache_file = filename + self.cache_ext
+            try:
+                st = os.stat(filename)
+                # O cache guarda tamanho e mtime do original: um arquivo restaurado com mtime
+                # mais antigo (cp -p, rsync -a, tar x) também invalida o cache
+                key = np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+                with np.load(cache_file) as cached:
+                    if np.array_equal(cached['key'], key):
+                        data = cached['data']
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                pass
+
+        if data is None:
+            data = self._read_spectrum_file(filename)
+            if data is not None and key is not None:
+                # Escreve em um temporário e renomeia, para não deixar um cache pela metade
+                tmp_file = cache_file + '.tmp' + self.cache_ext
+                try:
+                    np.savez(tmp_file, data=data, key=key)
+                    os.replace(tmp_file, cache_file)
+                except OSError:
+                    pass
+
+        if data is None or data.shape[1] <= flux_column:
+            return None
+        # Linhas curtas (completadas com NaN) só são descartadas se faltar a energia ou o fluxo escolhido
+        valid = ~(np.isnan(data[:,0]) | np.isnan(data[:,flux_column]))
+        if not valid.any():
+            return None
+        return Spectrum(data[valid,0], data[valid,flux_column])
+
+    def _read_spectrum_file(self, filename):
+        """
+        Lê o arquivo de texto do espectro. Retorna None se não houver dados válidos.
+        """
+        try:
+            data = np.loadtxt(filename, comments=self.comment_char, dtype=np.float64, ndmin=2)
+        except OSError:
+            return None
+        except ValueError:
+            # Cabeçalho em texto sem comment_char ou linhas irregulares
+            data = None
+
+        if data is None and pd is not None:
+            try:
+                # Linhas com colunas a mais são descartadas e as com colunas a menos completadas com NaN.
+                # memory_map lê direto do arquivo mapeado em memória; 'round_trip' converte como float()
+                df = pd.read_csv(filename, comment=self.comment_char, sep=r'\s+', header=None, dtype=np.float64,
+                                 engine='c', on_bad_lines='skip', memory_map=True, float_precision='round_trip')
+                data = df.to_numpy()
+            except (OSError, ValueError):
+                data = None
+
+        if data is None:
+            # Sem np.genfromtxt: ele emite avisos por linha rejeitada e o
+            # warnings.catch_warnings() para silenciá-los não é thread-safe
+            data = self._parse_lines(filename)
+
+        if data is not None and data.size:
+            return data
+        else:
+            # print(f"Aviso: Nenhuma linha de dados encontrada em {filename}")
+            return None
+
+    def _parse_lines(self, filename):
+        """
+        Leitura linha a linha, para arquivos com cabeçalho em texto sem comment_char ou linhas irregulares.
+        Ignora as linhas não numéricas e mantém as que têm o número de colunas mais comum, para que
+        linhas de metadados no início do arquivo não definam a largura da tabela.
         """
         try:
             with open(filename, 'r') as f:
                 lines = f.readlines()
-        except Exception as e:
+        except (OSError, ValueError):
             return None
 
         spectrum_lines = []
         for line in lines:
-            if '#' in line: continue
+            if self.comment_char in line: continue
             try:
-                spectrum_lines.append([float(l) for l in line.split()])
+                values = [float(l) for l in line.split()]
             except ValueError:
                 continue
-        
-        if spectrum_lines:
-            return np.array(spectrum_lines)
-        else:
-            # print(f"Aviso: Nenhuma linha de dados encontrada em {filename}")
+            if values:
+                spectrum_lines.append(values)
+
+        if not spectrum_lines:
             return None
+        width = Counter(len(values) for values in spectrum_lines).most_common(1)[0][0]
+        return np.array([values for values in spectrum_lines if len(values) == width])
     
-    def plot_spectrum_data(self, datas, energy_u='keV', flux_u='ph/s/eV', current=350, title=None, fileout=None):
+    def plot_spectrum_data(self, datas, energy_u=None, flux_u=None, current=None, title=None, fileout=None):
         """
         Plota os dados de espectro.
 
         Args:
-            datas (dict): Dicionário com os dados de espectro. A chave é o nome da linha e o valor é o array numpy com os dados.
-            energy_u (str, optional): Unidade de energia para o plot. O padrão é 'keV'.
-            flux_u (str, optional): Unidade de fluxo para o plot. O padrão é 'ph/s/eV'.
-            current (float, optional): Corrente da linha de luz. O padrão é 350.
+            datas (dict): Dicionário com os dados de espectro. A chave é o nome da linha e o valor é o Spectrum com os dados.
+            energy_u (str, optional): Unidade de energia para o plot. O padrão é plot_energy_u ('keV').
+            flux_u (str, optional): Unidade de fluxo para o plot. O padrão é plot_flux_u ('ph/s/eV').
+            current (float, optional): Corrente da linha de luz. O padrão é plot_current (350).
             title (str, optional): Título do plot. O padrão é None.
             fileout (str, optional): Arquivo png de saída do plot 
         """
+        if energy_u is None: energy_u = self.plot_energy_u
+        if flux_u is None: flux_u = self.plot_flux_u
+        if current is None: current = self.plot_current
+        e_scale = self.energy_unit[energy_u]
+        f_scale = self.flux_unit[flux_u]*current
+        curves = {}
+        for d in datas:
+            data = datas[d]
+            energy_data = data.energy / e_scale
+            flux_ev_data = data.flux * f_scale
+            curves[d] = (energy_data, flux_ev_data)
+
+        self._plot_curves(curves, energy_u, flux_u, current, title, fileout)
+
+    def _plot_curves(self, curves, energy_u, flux_u, current, title=None, fileout=None):
+        """
+        Plota curvas já convertidas para as unidades do plot. curves é um dicionário nome -> (energia, fluxo).
+        """
         plt.figure(figsize=(8,6))
         # plt.rcParams.update({"font.size":20})
         if title: plt.title(title)
@@ -69,10 +295,11 @@ class Espectros:
         plt.yscale('log')
         # plt.xscale('log')
 
-        for d in datas:
-            data = datas[d]
-            energy_data = data[:,0] / self.energy_unit[energy_u]
-            flux_ev_data = data[:,1] * self.flux_unit[flux_u]*current
+        for d in curves:
+            energy_data, flux_ev_data = curves[d]
+            # Pontos além da resolução do plot ficam sobrepostos; desenha só o envelope
+            if energy_data.size > 4000:
+                energy_data, flux_ev_data = _envelope(energy_data, flux_ev_data)
             plt.plot(energy_data, flux_ev_data, '-o', markersize=2, linewidth=1, label=d)
             
         plt.legend()
@@ -89,18 +316,27 @@ class Espectros:
         Converte dados de espectro de largura de banda para energia.
 
         Args:
-            data (numpy.ndarray): Dados do espectro como um array numpy, onde a primeira coluna é a largura de banda e a segunda é o fluxo.
+            data (Spectrum): Dados do espectro, com a largura de banda e o fluxo.
             energy_u (str, optional): Unidade de energia para a conversão. O padrão é 'eV'.
             flux_u (str, optional): Unidade de fluxo para a conversão. O padrão é 'ph/s/0.1%'.
             current (float, optional): Corrente da linha de luz. O padrão é 100.
 
         Returns:
-            numpy.ndarray: Dados do espectro convertidos para energia, onde a primeira coluna é a energia e a segunda é o fluxo.
+            Spectrum: Dados do espectro convertidos para energia.
+        """
+        return self._bandwidth_to_energy(data, self.energy_unit[energy_u], self.flux_unit[flux_u] / current)
+
+    def _bandwidth_to_energy(self, data, k_e, k_f):
+        """
+        bandwidth_to_energy com os fatores de unidade já resolvidos (k_f inclui a corrente).
         """
-        energy_data = data[:,0] * self.energy_unit[energy_u]
-        flux_ev_data = data[:,1] * self.flux_unit[flux_u] / data[:,0] / current
-        data[:,0] = energy_data
-        data[:,1] = flux_ev_data
+        if njit is not None:
+            _bw_to_energy_kernel(data.energy, data.flux, k_e, k_f)
+        else:
+            # In-place, sem arrays temporários; o fluxo é dividido antes de a energia mudar de unidade
+            np.multiply(data.flux, k_f, out=data.flux)
+            np.divide(data.flux, data.energy, out=data.flux)
+            np.multiply(data.energy, k_e, out=data.energy)
         return data
     
     def normalize_spectrum(self, data, energy_u='eV', flux_u='ph/s/eV', current=100):
@@ -108,18 +344,25 @@ class Espectros:
         Normaliza os dados do espectro pela corrente.
 
         Args:
-            data (numpy.ndarray): Dados do espectro como um array numpy, onde a primeira coluna é a energia e a segunda é o fluxo.
+            data (Spectrum): Dados do espectro, com a energia e o fluxo.
             energy_u (str, optional): Unidade de energia para a normalização. O padrão é 'eV'.
             flux_u (str, optional): Unidade de fluxo para a normalização. O padrão é 'ph/s/eV'.
             current (float, optional): Corrente da linha de luz. O padrão é 100.
 
         Returns:
-            numpy.ndarray: Dados do espectro normalizados, onde a primeira coluna é a energia e a segunda é o fluxo.
+            Spectrum: Dados do espectro normalizados.
+        """
+        return self._normalize_spectrum(data, self.energy_unit[energy_u], self.flux_unit[flux_u] / current)
+
+    def _normalize_spectrum(self, data, k_e, k_f):
+        """
+        normalize_spectrum com os fatores de unidade já resolvidos (k_f inclui a corrente).
         """
-        energy_data = data[:,0] * self.energy_unit[energy_u]
-        flux_ev_data = data[:,1] * self.flux_unit[flux_u] / current
-        data[:,0] = energy_data
-        data[:,1] = flux_ev_data
+        if njit is not None:
+            _normalize_kernel(data.energy, data.flux, k_e, k_f)
+        else:
+            np.multiply(data.energy, k_e, out=data.energy)
+            np.multiply(data.flux, k_f, out=data.flux)
         return data
 
     def plot_folder_spectrum(self, folder, spectrum_type='bandwidth', energy_u='eV', flux_u='ph/s/0.1%', current=1, recursive_check=True):
@@ -132,7 +375,7 @@ class Espectros:
             energy_u (str, optional): Unidade de energia para a conversão/normalização. O padrão é 'eV'.
             flux_u (str, optional): Unidade de fluxo para a conversão/normalização. O padrão é 'ph/s/0.1%'.
             current (float, optional): Corrente da linha de luz. O padrão é 1.
-            recursive_check (bool, optional): flag para verificar se está em recursão, o que evita o plot
+            recursive_check (bool, optional): flag que habilita o plot. Com False os espectros (inclusive das subpastas) são apenas carregados
 
         Returns:
             dict: Dicionário de espéctros com chaves sendo o nome do arquivo e o valor sendo os dados do espectro normalizados.
@@ -140,63 +383,109 @@ class Espectros:
         if not os.path.isdir(folder):
             return
         
-        espec = {}
-        for file in sorted( os.listdir(folder) ):
-            filepath = os.path.join(folder, file)
-
-            if os.path.isdir(filepath):
-                # Chama recursivamente para subpastas
-                espec.update(self.plot_folder_spectrum(filepath, spectrum_type, energy_u, flux_u, current, recursive_check=False))
+        files = self._list_folder_files(folder)
+        # A leitura é feita em paralelo; os parsers do numpy/pandas liberam o GIL
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            datas = list(ex.map(self.get_spectrum_data, [filepath for _, filepath in files]))
+
+        k_e = self.energy_unit[energy_u]
+        k_f = self.flux_unit[flux_u] / current
+        bandwidth = spectrum_type == 'bandwidth'
+        convert = self._bandwidth_to_energy if bandwidth else self._normalize_spectrum
+        inv_ke_plot = 1 / self.energy_unit[self.plot_energy_u]
+        kf_plot = self.flux_unit[self.plot_flux_u] * self.plot_current
 
-            data = self.get_spectrum_data(filepath)
+        espec = {}
+        curves = {}
+        for (file, _), data in zip(files, datas):
             if data is None: continue
 
-            if spectrum_type == 'bandwidth':
-                data = self.bandwidth_to_energy(data, energy_u=energy_u, flux_u=flux_u, current=current)
+            if recursive_check:
+                data, curves[file] = self._to_plot_space(data, k_e, k_f, bandwidth, inv_ke_plot, kf_plot)
             else:
-                data = self.normalize_spectrum(data, energy_u=energy_u, flux_u=flux_u, current=current)
-            # print(sum(data[:,1]))
+                data = convert(data, k_e, k_f)
+            # print(sum(data.flux))
             espec[file] = data
 
         if espec and recursive_check:  # Verifica se há espectros para plotar
-            self.plot_spectrum_data(espec, title=folder)
+            self._plot_curves(curves, self.plot_energy_u, self.plot_flux_u, self.plot_current, title=folder)
 
         return espec # Retorna os espectros encontrados
 
+    def _to_plot_space(self, data, k_e, k_f, bandwidth, inv_ke_plot, kf_plot):
+        """
+        Converte o espectro como _bandwidth_to_energy/_normalize_spectrum e retorna também
+        a curva (energia, fluxo) nas unidades do plot.
+        """
+        out_e = np.empty_like(data.energy)
+        out_f = np.empty_like(data.flux)
+        if njit is not None:
+            _to_plot_space_kernel(data.energy, data.flux, k_e, k_f, bandwidth, inv_ke_plot, kf_plot, out_e, out_f)
+        else:
+            data = self._bandwidth_to_energy(data, k_e, k_f) if bandwidth else self._normalize_spectrum(data, k_e, k_f)
+            np.multiply(data.energy, inv_ke_plot, out=out_e)
+            np.multiply(data.flux, kf_plot, out=out_f)
+        return data, (out_e, out_f)
+
+    def _list_folder_files(self, folder):
+        """
+        Lista (nome, caminho) dos arquivos da pasta e, recursivamente, das subpastas.
+        """
+        # DirEntry.is_dir() usa o tipo lido junto com o diretório, sem um stat() por arquivo
+        with os.scandir(folder) as it:
+            entries = sorted(it, key=lambda e: e.name)
+
+        files = []
+        for entry in entries:
+            if self.cache and entry.name.endswith(self.cache_ext): continue
+
+            if entry.is_dir():
+                files.extend(self._list_folder_files(entry.path))
+            else:
+                files.append((entry.name, entry.path))
+        return files
+
     def write_data_file(self, data, filename, energy_u='eV', flux_u='ph/s/eV', current=1, decimal_places=3):
         """
         Escreve os dados do espectro em um arquivo.
 
         Args:
-            data (numpy.ndarray): Dados do espectro como um array numpy, onde a primeira coluna é a energia e a segunda é o fluxo.
+            data (Spectrum): Dados do espectro, com a energia e o fluxo.
             filename (str): Nome do arquivo para salvar os dados.
             energy_u (str, optional): Unidade de energia para a conversão/normalização. O padrão é 'eV'.
             flux_u (str, optional): Unidade de fluxo para a conversão/normalização. O padrão é 'ph/s/eV'.
             current (float, optional): Corrente da linha de luz. O padrão é 1.
             decial_places (int, optional): Casas decimais para a escrita dos valores de energia e fluxo. O padrão é 3
         """
-        energy_label = f"#Energy ({energy_u})"
+        energy_label = f"{self.comment_char}Energy ({energy_u})"
         flux_label = f"Flux ({flux_u}/{current}mA)"
-        energy_data = data[:,0] / self.energy_unit[energy_u]
-        flux_ev_data = data[:,1] * self.flux_unit[flux_u]*current
+        energy_data = data.energy / self.energy_unit[energy_u]
+        flux_ev_data = data.flux * self.flux_unit[flux_u]*current
 
-        max1 = max( max( [len(f'{en}') for en in energy_data] ), len(energy_label) )
-        max2 = max( max( [len(f'{fl}') for fl in flux_ev_data] ), len(flux_label) )
+        max1 = max(_sci_width(energy_data, decimal_places), len(energy_label))
+        max2 = max(_sci_width(flux_ev_data, decimal_places), len(flux_label))
 
-        data_write = [f'{en:>{max1}.{decimal_places}E} {fl:>{max2}.{decimal_places}E}\n' for en, fl in zip(energy_data, flux_ev_data)]
-        with open(filename, 'w') as f:
-            f.write(f'{energy_label:>{max1}} {flux_label:>{max2}}\n')
-            f.writelines(data_write)
+        # Buffer de 1 MiB: o savetxt escreve linha a linha
+        with open(filename, 'w', buffering=1 << 20) as f:
+            np.savetxt(f, np.column_stack([energy_data, flux_ev_data]),
+                       fmt=f'%{max1}.{decimal_places}E %{max2}.{decimal_places}E',
+                       header=f'{energy_label:>{max1}} {flux_label:>{max2}}', comments='')
 
     def integrate_spectrum(self, data, energy_u='eV', flux_u='ph/s/eV', current=100):
-        energy_data = data[:,0] * self.energy_unit[energy_u]
-        flux_ev_data = data[:,1] * self.flux_unit[flux_u] / current
-        integrated_spectrum = simps(y=flux_ev_data, x=energy_data)
+        # As conversões de unidade são lineares e saem da integral
+        k_e = self.energy_unit[energy_u]
+        k_f = self.flux_unit[flux_u] / current
+        if njit is not None:
+            integral = _simpson_kernel(data.flux, data.energy)
+        else:
+            # Importado só aqui: o scipy demora para carregar e só é usado nesta função
+            from scipy.integrate import simpson
+            integral = simpson(data.flux, x=data.energy)
+        integrated_spectrum = integral * k_e * k_f
         return integrated_spectrum
     
     def integrate_discrete(self, data, flux_u='ph/s/eV', current=100):
-        flux_ev_data = data[:,1] * self.flux_unit[flux_u] / current
-        integrated_spectrum = sum(flux_ev_data)
+        integrated_spectrum = data.flux.sum() * (self.flux_unit[flux_u] / current)
         return integrated_spectrum
 
         
@@ -236,10 +525,9 @@ if __name__ == '__main__':
 
     # Carregar dados de um arquivo
     file = 'spectrum_data/Sussuarana/OPT/SUSSUARANA_SWLS_flux_1p58x0p66mrad2_lowE.txt'
-    data = espectros.get_spectrum_data(file)
-    # Selecionando as colunas de energia e fluxo
+    # Selecionando a coluna de fluxo
     # Necessário quando o fluxo não é a coluna de índice 1
-    data = data[:,[0,3]]
+    data = espectros.get_spectrum_data(file, flux_column=3)
     # Converter dados de largura de banda para energia
     data = espectros.bandwidth_to_energy(data, current=100, energy_u='keV', flux_u='ph/s/0.1%')
     # Escrever dados em um arquivo
@@ -0,0 +1,143 @@
+import os
+
+import numpy as np
+import pytest
+
+from Sirius_Espectros import Espectros, Spectrum, _envelope
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spectrum_data')
+
+
+def data_file(*parts):
+    return os.path.join(DATA_DIR, *parts)
+
+
+def test_text_header_without_comment_char():
+    # Cabeçalho em texto, sem '#', com mais colunas que os dados
+    espectros = Espectros()
+    for name, rows in (('FINAL_FLUX_10keV.txt', 30), ('FINAL_FLUX_20keV.txt', 15)):
+        data = espectros.get_spectrum_data(data_file('Paineira', 'OPT', 'experimental', 'VS2', name))
+        assert data is not None
+        assert data.energy.shape == (rows,)
+        assert data.flux.shape == (rows,)
+
+
+def test_metadata_rows_do_not_set_table_width():
+    # Cabeçalho do SPECTRA com linhas numéricas de metadados (7 colunas) antes dos dados (6 colunas)
+    espectros = Espectros()
+    data = espectros.get_spectrum_data(data_file('Caterete', 'OPT', 'K=1p0', 'CAT_D21_2p4m_K1p0_21x50urad2_2xRh_3mrad_flux.dft'))
+    assert data.energy.size == 19981
+    assert data.energy[0] == 100.0 and data.flux[0] == 1.242e10
+
+def test_values_match_float():
+    # Mantissa longa, truncada pelo conversor padrão do pandas
+    espectros = Espectros()
+    filename = data_file('Ema', 'OPT', 'EMA_HRM_2p3mrad_Rh.txt')
+    data = espectros.get_spectrum_data(filename)
+    with open(filename) as f:
+        for line in f:
+            if '0.00000180769759529732' in line:
+                energy = float(line.split()[0])
+                break
+    assert data.flux[data.energy == energy][0] == 1.80769759529732e-06
+
+
+def test_nan_in_unused_column_keeps_row():
+    # As linhas de 4000 e 4500 eV têm 'nan' apenas em colunas não usadas
+    espectros = Espectros()
+    data = espectros.get_spectrum_data(data_file('Sapucaia', 'OPT', 'undulator', 'KYMA_highB_SA.txt'))
+    assert data.energy.size == 67
+    assert 4000 in data.energy and 4500 in data.energy
+
+
+def test_envelope_keeps_data_points_and_ends():
+    x = np.linspace(0, 1, 100001)
+    y = np.sin(40 * x)
+    env_x, env_y = _envelope(x, y)
+    assert env_x.size <= 2 * 2000 + 2
+    assert env_x[0] == x[0] and env_x[-1] == x[-1]
+    # Todos os pontos desenhados pertencem aos dados
+    idx = np.searchsorted(x, env_x)
+    assert np.array_equal(x[idx], env_x) and np.array_equal(y[idx], env_y)
+    assert env_y.max() == y.max() and env_y.min() == y.min()
+
+
+def write_spectrum(path, rows):
+    with open(path, 'w') as f:
+        f.write('#Energy Flux\n')
+        for energy, flux in rows:
+            f.write(f'{energy} {flux}\n')
+
+
+def test_cache_hit_and_invalidation(tmp_path):
+    filename = str(tmp_path / 'spectrum.txt')
+    write_spectrum(filename, [(1, 10), (2, 20), (3, 30)])
+    espectros = Espectros(cache=True)
+    assert espectros.get_spectrum_data(filename).flux.tolist() == [10, 20, 30]
+    cache_file = filename + espectros.cache_ext
+    assert os.path.exists(cache_file)
+
+    # Acerto do cache: o texto não é relido
+    espectros._read_spectrum_file = lambda filename: pytest.fail('cache não foi usado')
+    assert espectros.get_spectrum_data(filename).flux.tolist() == [10, 20, 30]
+    del espectros._read_spectrum_file
+
+    # Original restaurado com mtime mais antigo que o cache (cp -p, rsync -a)
+    st = os.stat(filename)
+    write_spectrum(filename, [(1, 11), (2, 21), (3, 31)])
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+    assert espectros.get_spectrum_data(filename).flux.tolist() == [11, 21, 31]
+
+    # Mesmo mtime, tamanho diferente
+    st = os.stat(filename)
+    write_spectrum(filename, [(1, 12), (2, 22), (3, 32), (4, 42)])
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert espectros.get_spectrum_data(filename).flux.tolist() == [12, 22, 32, 42]
+
+
+def test_cache_files_listed_only_without_cache(tmp_path):
+    write_spectrum(str(tmp_path / 'spectrum.txt'), [(1, 10), (2, 20)])
+    (tmp_path / 'table.npz').write_bytes(b'')
+    names = lambda espectros: [name for name, _ in espectros._list_folder_files(str(tmp_path))]
+    assert names(Espectros()) == ['spectrum.txt', 'table.npz']
+    assert names(Espectros(cache=True)) == ['spectrum.txt']
+
+
+def test_plot_units_follow_instance_overrides(tmp_path, monkeypatch):
+    # plot_spectrum_data e plot_folder_spectrum usam as mesmas unidades padrão
+    write_spectrum(str(tmp_path / 'spectrum.txt'), [(1, 10), (2, 20)])
+    espectros = Espectros()
+    espectros.plot_energy_u, espectros.plot_flux_u, espectros.plot_current = 'eV', 'ph/s/0.1%', 100
+    calls = []
+    monkeypatch.setattr(espectros, '_plot_curves', lambda curves, *args, **kwargs: calls.append(args[:3]))
+    datas = espectros.plot_folder_spectrum(str(tmp_path), spectrum_type='energy', flux_u='ph/s/eV')
+    espectros.plot_spectrum_data(datas)
+    assert calls == [('eV', 'ph/s/0.1%', 100)] * 2
+
+
+@pytest.mark.parametrize('decimal_places', [3, 12])
+def test_write_data_file_layout(tmp_path, decimal_places):
+    # Valores negativos e expoentes de três dígitos não podem desalinhar as colunas
+    filename = str(tmp_path / 'out.spectrum')
+    energy = np.array([1.0, 2.5e3, 9.87654e250])
+    flux = np.array([-1.5e-120, 3.25e12, -7.0])
+    espectros = Espectros()
+    espectros.write_data_file(Spectrum(energy, flux), filename, decimal_places=decimal_places)
+
+    with open(filename) as f:
+        lines = f.read().splitlines()
+    energy_label, flux_label = '#Energy (eV)', 'Flux (ph/s/eV/1mA)'
+    # Energia positiva: 'E+250' cabe no espaço do sinal. Fluxo: sinal e 'E-120'
+    width1 = max(len(energy_label), decimal_places + 7)
+    width2 = max(len(flux_label), decimal_places + 8)
+    assert lines[0] == f'{energy_label:>{width1}} {flux_label:>{width2}}'
+    assert len(lines) == 4
+    for line, en, fl in zip(lines[1:], energy, flux):
+        assert len(line) == width1 + 1 + width2
+        assert line[width1] == ' '
+        assert line[:width1] == f'{en:>{width1}.{decimal_places}E}'
+        assert line[width1 + 1:] == f'{fl:>{width2}.{decimal_places}E}'
+    # O arquivo escrito é lido de volta sem o cabeçalho
+    data = espectros.get_spectrum_data(filename)
+    np.testing.assert_allclose(data.energy, energy, rtol=10**-decimal_places)
+    np.testing.assert_allclose(data.flux, flux, rtol=10**-decimal_places)
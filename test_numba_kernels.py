@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('numba')
+scipy_integrate = pytest.importorskip('scipy.integrate')
+
+import Sirius_Espectros
+from test_Sirius_Espectros import data_file
+
+
+@pytest.mark.parametrize('n', [2, 3, 4, 7, 10, 101, 1000])
+def test_simpson_kernel_matches_scipy(n):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 10, n))
+    y = rng.uniform(1, 2, n)
+    expected = scipy_integrate.simpson(y, x=x)
+    assert Sirius_Espectros._simpson_kernel(y, x) == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize('n', [3, 4, 7, 10])
+@pytest.mark.parametrize('repeat', [0, 1, -2, -1])
+def test_simpson_kernel_repeated_energies(n, repeat):
+    # Energias repetidas: intervalos de largura zero
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 10, n))
+    x[repeat] = x[repeat - 1] if repeat != 0 else x[1]
+    x = np.sort(x)
+    y = rng.uniform(1, 2, n)
+    expected = scipy_integrate.simpson(y, x=x)
+    result = Sirius_Espectros._simpson_kernel(y, x)
+    assert np.isfinite(result)
+    assert result == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize('name', [
+    ('Sabia', 'STAC8', 'aftM1.dat'),
+    ('Ema', 'FLUKA', 'mA', 'completo', 'sr.spectrum'),
+    ('Ema', 'STAC8', 'mA', 'completo', 'spectrum.DAT'),
+    ('Diagnostico', 'OPT', 'Rubens', 'tr13.spec.txt'),
+])
+def test_integrate_spectrum_with_repeated_energies(name):
+    espectros = Sirius_Espectros.Espectros()
+    data = espectros.get_spectrum_data(data_file(*name))
+    expected = scipy_integrate.simpson(data.flux, x=data.energy) / 100
+    assert espectros.integrate_spectrum(data) == pytest.approx(expected, rel=1e-12)
+
+
+def random_spectrum(n=1001, seed=0):
+    rng = np.random.default_rng(seed)
+    energy = np.sort(rng.uniform(100, 1e5, n))
+    flux = rng.uniform(1e8, 1e14, n)
+    return Sirius_Espectros.Spectrum(energy, flux)
+
+
+def copy_spectrum(data):
+    return Sirius_Espectros.Spectrum(data.energy.copy(), data.flux.copy())
+
+
+def without_numba(monkeypatch):
+    # Os métodos escolhem o caminho NumPy quando njit é None
+    monkeypatch.setattr(Sirius_Espectros, 'njit', None)
+
+
+def assert_same_spectrum(result, expected):
+    np.testing.assert_allclose(result.energy, expected.energy, rtol=1e-12)
+    np.testing.assert_allclose(result.flux, expected.flux, rtol=1e-12)
+
+
+@pytest.mark.parametrize('method, kwargs', [
+    ('bandwidth_to_energy', dict(energy_u='keV', flux_u='ph/s/0.1%', current=100)),
+    ('normalize_spectrum', dict(energy_u='eV', flux_u='ph/s/eV', current=350)),
+])
+def test_conversion_kernels_match_numpy(monkeypatch, method, kwargs):
+    data = random_spectrum()
+    espectros = Sirius_Espectros.Espectros()
+    result = getattr(espectros, method)(copy_spectrum(data), **kwargs)
+    without_numba(monkeypatch)
+    expected = getattr(espectros, method)(copy_spectrum(data), **kwargs)
+    assert_same_spectrum(result, expected)
+
+
+@pytest.mark.parametrize('bandwidth', [True, False])
+def test_to_plot_space_kernel_matches_numpy(monkeypatch, bandwidth):
+    data = random_spectrum()
+    espectros = Sirius_Espectros.Espectros()
+    args = (1e3, 1000 / 100, bandwidth, 1 / 1e3, 350)
+    result, (energy, flux) = espectros._to_plot_space(copy_spectrum(data), *args)
+    without_numba(monkeypatch)
+    expected, (expected_energy, expected_flux) = espectros._to_plot_space(copy_spectrum(data), *args)
+    assert_same_spectrum(result, expected)
+    np.testing.assert_allclose(energy, expected_energy, rtol=1e-12)
+    np.testing.assert_allclose(flux, expected_flux, rtol=1e-12)
+
+
+@pytest.mark.parametrize('spectrum_type, flux_u', [('bandwidth', 'ph/s/0.1%'), ('energy', 'ph/s/eV')])
+def test_plot_folder_spectrum_matches_numpy(monkeypatch, spectrum_type, flux_u):
+    folder = data_file('Hibisco', 'HIB_source_flux')
+
+    def run():
+        espectros = Sirius_Espectros.Espectros()
+        curves = {}
+        monkeypatch.setattr(espectros, '_plot_curves', lambda c, *args, **kwargs: curves.update(c))
+        return espectros.plot_folder_spectrum(folder, spectrum_type=spectrum_type, flux_u=flux_u, current=100), curves
+
+    result, curves = run()
+    without_numba(monkeypatch)
+    expected, expected_curves = run()
+    assert result and list(result) == list(expected) == list(curves) == list(expected_curves)
+    for name in result:
+        assert_same_spectrum(result[name], expected[name])
+        for got, want in zip(curves[name], expected_curves[name]):
+            np.testing.assert_allclose(got, want, rtol=1e-12)